@@ -1,5 +1,11 @@
 from flask import Flask, render_template, request, redirect, url_for, session
+import gc
+import json
+import os
+import threading
 import urllib.parse 
+import heapq
+from collections import Counter
 
 # STRUKTUR DATA: NODE, DOUBLY LINKED LIST, HASH TABLE
 
@@ -25,6 +31,20 @@ class PlaylistDLL:
         self.head = None
         self.tail = None
         self.size = 0
+
+    @classmethod
+    def from_song_ids(cls, song_ids):
+        """Membangun playlist dari list ID lagu yang sudah unik. O(N)."""
+        playlist = cls()
+        for song_id in song_ids:
+            new_node = DLLNode(song_id, prev_node=playlist.tail)
+            if playlist.tail:
+                playlist.tail.next = new_node
+            else:
+                playlist.head = new_node
+            playlist.tail = new_node
+            playlist.size += 1
+        return playlist
         
     def contains_song_id(self, song_id):
         """Memeriksa apakah ID lagu sudah ada di playlist. O(N)."""
@@ -90,19 +110,52 @@ class PlaylistDLL:
         return removed_count
 
 class LibraryHashTable:
-    """Hash Table (Python Dict) untuk menyimpan semua lagu global."""
+    """Hash Table (Python Dict) untuk menyimpan semua lagu global.
+    Dilengkapi postings list (genre/artis -> set ID lagu) untuk browse per facet."""
     def __init__(self):
         self.data = {}
         self.next_id = 1
+        self.genre_index = {}
+        self.artist_index = {}
+
+    def _index_song(self, song):
+        """Menambahkan ID lagu ke postings list genre dan artisnya (key di-strip)."""
+        for index, key in ((self.genre_index, song.genre.strip()), (self.artist_index, song.artist.strip())):
+            if key:
+                index.setdefault(key, set()).add(song.id)
+
+    def _unindex_song(self, song):
+        """Menghapus ID lagu dari postings list genre dan artisnya."""
+        for index, key in ((self.genre_index, song.genre.strip()), (self.artist_index, song.artist.strip())):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(song.id)
+                if not ids:
+                    del index[key]
 
     def add_song(self, title, artist, genre):
         """Menambahkan lagu baru ke library."""
         song_id = str(self.next_id)
         song = Song(song_id, title, artist, genre)
         self.data[song_id] = song
+        self._index_song(song)
         self.next_id += 1
         return song_id
 
+    def restore_song(self, song_id, title, artist, genre):
+        """Memasukkan lagu dengan ID yang sudah ada (dipakai saat memuat snapshot)."""
+        song = Song(song_id, title, artist, genre)
+        self.data[song_id] = song
+        self._index_song(song)
+        self.next_id = max(self.next_id, int(song_id) + 1)
+
+    def clear(self):
+        """Mengosongkan library."""
+        self.data = {}
+        self.next_id = 1
+        self.genre_index = {}
+        self.artist_index = {}
+
     def get_all_songs(self):
         """Mengembalikan semua objek lagu."""
         results = list(self.data.values())
@@ -118,27 +171,32 @@ class LibraryHashTable:
         song = self.data.get(song_id)
         if not song:
             return False
+        self._unindex_song(song)
         song.title = title
         song.artist = artist
         song.genre = genre
+        self._index_song(song)
         return True
 
     def delete_song(self, song_id):
         """Hapus lagu dari library."""
         if song_id in self.data:
-            del self.data[song_id]
+            self._unindex_song(self.data.pop(song_id))
             return True
         return False
 
-    def search_songs(self, query):
-        """Mencari lagu berdasarkan query (title, artist, id, genre). O(N)."""
+    def search_songs(self, query, songs=None):
+        """Mencari lagu berdasarkan query (title, artist, id, genre). O(N).
+        Jika songs diberikan, pencarian hanya dilakukan di dalam list tersebut."""
         if not query:
+            if songs is not None:
+                return list(songs)
             results = self.get_all_songs()
             return results
         
         query = query.lower()
         results = []
-        for song in self.data.values():
+        for song in (self.data.values() if songs is None else songs):
             if (query in song.title.lower() or 
                 query in song.artist.lower() or 
                 query in song.genre.lower() or
@@ -147,6 +205,36 @@ class LibraryHashTable:
         results.sort(key=lambda s: int(s.id))
         return results
 
+    def browse(self, genre=None, artist=None):
+        """Filter lagu berdasarkan genre dan/atau artis (exact match) dengan
+        mengiris postings list, dimulai dari list terkecil. O(K) untuk K hasil."""
+        genre = (genre or '').strip()
+        artist = (artist or '').strip()
+        postings = []
+        if genre:
+            postings.append(self.genre_index.get(genre, set()))
+        if artist:
+            postings.append(self.artist_index.get(artist, set()))
+        if not postings:
+            return self.get_all_songs()
+
+        postings.sort(key=len)
+        ids = postings[0].intersection(*postings[1:])
+        results = [self.data[song_id] for song_id in ids]
+        results.sort(key=lambda s: int(s.id))
+        return results
+
+    def facet_counts(self, field, songs=None):
+        """Jumlah lagu per nilai field ('genre' atau 'artist').
+        Tanpa songs, dihitung dari ukuran postings list (tanpa scan library);
+        jika songs diberikan, dihitung dari hasil tersebut saja."""
+        if songs is None:
+            index = self.genre_index if field == 'genre' else self.artist_index
+            return {key: len(ids) for key, ids in index.items()}
+        counts = Counter(getattr(s, field).strip() for s in songs)
+        counts.pop('', None)
+        return dict(counts)
+
 
 # LOGIC KESAMAAN
 def find_similar_song_id(current_song_id, played_song_ids):
@@ -203,43 +291,53 @@ def find_similar_song_id(current_song_id, played_song_ids):
 app = Flask(__name__)
 app.secret_key = 'super_secret_key_musik' 
 
+# Library dan USERS dibuat kosong saat import; pengisian data awal dilakukan
+# oleh create_app(), atau pada request pertama jika modul hanya di-import
+# (mis. `flask --app app run`, `gunicorn app:app`), agar import tetap ringan.
 global_library = LibraryHashTable()
-
-
-global_library.add_song("Hymn for the Weekend", "Coldplay", "Pop") 
-global_library.add_song("Bohemian Rhapsody", "Queen", "Rock")      
-global_library.add_song("Happier Than Ever", "Billie Eilish", "Pop") 
-global_library.add_song("Toxic", "Britney Spears", "Pop")          
-global_library.add_song("Lose Yourself", "Eminem", "Hip Hop")     
-global_library.add_song("Lovesick Girls", "BLACKPINK", "K-Pop") 
-global_library.add_song("Levitating", "Dua Lipa", "Pop") 
-global_library.add_song("Yellow", "Coldplay", "Rock") 
-global_library.add_song("Satu-Satu", "Idgitaf", "Pop") 
-global_library.add_song("Industry Baby", "Lil Nas X", "Hip Hop") 
-global_library.add_song("Dynamite", "BTS", "K-Pop") 
-global_library.add_song("Stairway to Heaven", "Led Zeppelin", "Rock") 
-global_library.add_song("Monokrom", "Tulus", "Jazz") 
-
-
-# Data User: 
-USERS = {
+USERS = {}
+
+SEED_SONGS = [
+    ("Hymn for the Weekend", "Coldplay", "Pop"),
+    ("Bohemian Rhapsody", "Queen", "Rock"),
+    ("Happier Than Ever", "Billie Eilish", "Pop"),
+    ("Toxic", "Britney Spears", "Pop"),
+    ("Lose Yourself", "Eminem", "Hip Hop"),
+    ("Lovesick Girls", "BLACKPINK", "K-Pop"),
+    ("Levitating", "Dua Lipa", "Pop"),
+    ("Yellow", "Coldplay", "Rock"),
+    ("Satu-Satu", "Idgitaf", "Pop"),
+    ("Industry Baby", "Lil Nas X", "Hip Hop"),
+    ("Dynamite", "BTS", "K-Pop"),
+    ("Stairway to Heaven", "Led Zeppelin", "Rock"),
+    ("Monokrom", "Tulus", "Jazz"),
+]
+
+# Data User: password dan playlist awal (berisi ID lagu)
+SEED_USERS = {
     'user1': {
         'password': 'user123',
         'playlists': {
-            'favorit': PlaylistDLL(),
-            'mood': PlaylistDLL(),
-            'sad': PlaylistDLL() 
+            'favorit': ['1', '3', '5'],
+            'mood': ['2', '4', '1'],
+            'sad': ['6', '7', '8', '9', '10'],
         },
-        'active_playlist_name': None,
-        'current_song_id': None,
-        'current_node': None, 
-        'current_queue_ids': [],    
-        'current_queue_index': -1,
-        'explicit_queue_ids': [], 
     },
     'admin': {
         'password': 'admin123',
         'playlists': {},
+    },
+}
+
+_seed_lock = threading.RLock()
+_seed_pending = True
+
+
+def new_user_data(password, playlists=None):
+    """Membuat data state user baru (playlist + status pemutaran)."""
+    return {
+        'password': password,
+        'playlists': playlists if playlists is not None else {},
         'active_playlist_name': None,
         'current_song_id': None,
         'current_node': None, 
@@ -247,11 +345,144 @@ USERS = {
         'current_queue_index': -1,
         'explicit_queue_ids': [],
     }
-}
+
+
+def _load_state(songs, users, next_id=1):
+    """Mengganti isi library dan USERS (in-place) dengan data mentah.
+    Setiap pemuatan eksplisit membatalkan lazy seed yang masih tertunda."""
+    global _seed_pending
+
+    with _seed_lock:
+        _seed_pending = False
+    global_library.clear()
+    for song_id, title, artist, genre in songs:
+        global_library.restore_song(song_id, title, artist, genre)
+    global_library.next_id = max(global_library.next_id, next_id)
+
+    USERS.clear()
+    for username, user in users.items():
+        playlists = {name: PlaylistDLL.from_song_ids(ids)
+                     for name, ids in user['playlists'].items()}
+        USERS[username] = new_user_data(user['password'], playlists)
+
+
+def seed_data():
+    """Mengisi library dan USERS dengan data awal (SEED_SONGS, SEED_USERS)."""
+    songs = [(str(i), title, artist, genre)
+             for i, (title, artist, genre) in enumerate(SEED_SONGS, start=1)]
+    _load_state(songs, SEED_USERS)
+
+
+def save_snapshot(path):
+    """Menyimpan katalog dan playlist saat ini ke file snapshot (JSON)."""
+    songs = [(s.id, s.title, s.artist, s.genre) for s in global_library.get_all_songs()]
+    users = {
+        username: {
+            'password': user['password'],
+            'playlists': {name: dll.get_song_ids() for name, dll in user['playlists'].items()},
+        }
+        for username, user in USERS.items()
+    }
+    snapshot = {'next_id': global_library.next_id, 'songs': songs, 'users': users}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False, indent=1)
+
+
+def load_snapshot(path):
+    """Memuat katalog dan playlist dari file snapshot buatan save_snapshot()."""
+    with open(path, encoding='utf-8') as f:
+        snapshot = json.load(f)
+    _load_state(snapshot['songs'], snapshot['users'], snapshot.get('next_id', 1))
+
+
+def create_app(seed=None, freeze=False):
+    """App factory. Mode seed diambil dari argumen atau env MOOSI_SEED:
+    'eager' (default) mengisi data sekarang, 'lazy' saat request pertama,
+    'none' tidak mengisi apa pun, selain itu dianggap path file snapshot.
+
+    freeze=True hanya untuk master server pre-fork (mis. gunicorn --preload
+    "app:create_app(freeze=True)"): data yang sudah dimuat dibekukan dari GC
+    agar halaman memorinya tetap dibagi (copy-on-write) oleh semua worker.
+    Objek yang dibekukan tidak pernah di-collect, jadi jangan dipakai jika
+    create_app() dipanggil berulang kali."""
+    global _seed_pending
+
+    if seed is None:
+        seed = os.environ.get('MOOSI_SEED', 'eager')
+    app.config['MOOSI_SEED'] = seed
+
+    with _seed_lock:
+        _seed_pending = False
+        if seed == 'eager':
+            seed_data()
+        elif seed == 'lazy':
+            _load_state([], {})
+            _seed_pending = True
+        elif seed == 'none':
+            _load_state([], {})
+        else:
+            load_snapshot(seed)
+
+    if freeze and seed != 'lazy':
+        gc.freeze()
+    return app
+
+
+@app.before_request
+def _seed_on_first_request():
+    """Mengisi data awal pada request pertama jika mode seed 'lazy'."""
+    global _seed_pending
+
+    if not _seed_pending:
+        return
+    with _seed_lock:
+        if _seed_pending:
+            seed_data()
+            _seed_pending = False
+
+
+ARTIST_FACET_LIMIT = 20
 
 def get_user_data(username):
     return USERS.get(username)
 
+def get_library_songs(query, genre='', artist=''):
+    """Lagu untuk tampilan library: hasil browse facet (genre/artis),
+    lalu disaring lagi dengan query pencarian jika ada."""
+    if genre or artist:
+        return global_library.search_songs(query, global_library.browse(genre, artist))
+    return global_library.search_songs(query)
+
+def get_facets(songs, query, genre='', artist=''):
+    """Facet (nama, jumlah) genre dan artis untuk sidebar library.
+    songs adalah hasil get_library_songs(query, genre, artist). Tiap dimensi
+    dihitung hanya dengan filter dimensi lainnya, agar pilihan lain tetap
+    tampil. Facet artis hanya muncul jika genre dipilih, dibatasi
+    ARTIST_FACET_LIMIT artis dengan lagu terbanyak. Filter yang sedang
+    dipilih selalu ikut (walau jumlahnya 0) agar bisa dilepas lagi."""
+    if genre:
+        genre_base = get_library_songs(query, '', artist) if (query or artist) else None
+    else:
+        genre_base = songs if (query or artist) else None
+    genre_counts = global_library.facet_counts('genre', genre_base)
+    if genre:
+        genre_counts.setdefault(genre, 0)
+
+    if genre:
+        artist_base = get_library_songs(query, genre, '') if artist else songs
+        artist_counts = global_library.facet_counts('artist', artist_base)
+    elif artist:
+        # Tanpa genre, cukup tampilkan artis terpilih agar filternya bisa dilepas
+        artist_counts = {artist: len(songs)}
+    else:
+        artist_counts = {}
+
+    artist_facets = heapq.nlargest(ARTIST_FACET_LIMIT, artist_counts.items(),
+                                   key=lambda item: item[1])
+    if artist and artist not in dict(artist_facets):
+        artist_facets.append((artist, artist_counts.get(artist, 0)))
+    return sorted(genre_counts.items()), sorted(artist_facets)
+
 @app.route('/', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
@@ -350,6 +581,8 @@ def user_dashboard():
     view_mode = request.args.get('view', 'library')
     playlist_name = request.args.get('playlist')
     search_query = request.args.get('query', '')
+    genre_filter = request.args.get('genre', '').strip()
+    artist_filter = request.args.get('artist', '').strip()
     
     playlists = list(user['playlists'].keys())
     
@@ -357,10 +590,14 @@ def user_dashboard():
     current_view_playlist = None
     
     if view_mode == 'library':
-        songs = global_library.search_songs(search_query)
+        songs = get_library_songs(search_query, genre_filter, artist_filter)
     
         if search_query:
             current_view_playlist = f"Hasil Pencarian: '{search_query}'"
+        elif genre_filter or artist_filter:
+            current_view_playlist = " / ".join(f for f in (genre_filter, artist_filter) if f)
+
+        genre_facets, artist_facets = get_facets(songs, search_query, genre_filter, artist_filter)
     
     elif view_mode == 'playlist' and playlist_name in user['playlists']:
         playlist_dll = user['playlists'][playlist_name]
@@ -368,11 +605,15 @@ def user_dashboard():
       
         songs = [global_library.get_song_by_id(sid) for sid in song_ids if global_library.get_song_by_id(sid)]
         current_view_playlist = playlist_name
+        # Facet genre di tampilan playlist dihitung dari isi playlist itu sendiri
+        genre_facets = sorted(global_library.facet_counts('genre', songs).items())
+        artist_facets = []
         
     else:
         
         view_mode = 'library'
         songs = global_library.get_all_songs()
+        genre_facets, artist_facets = get_facets(songs, '')
         
     current_song = global_library.get_song_by_id(user['current_song_id'])
     
@@ -386,7 +627,11 @@ def user_dashboard():
                            current_song=current_song,
                            active_playlist_name=user['active_playlist_name'],
                            current_view_playlist=current_view_playlist,
-                           explicit_queue_list=explicit_queue_list) 
+                           explicit_queue_list=explicit_queue_list,
+                           genre_filter=genre_filter,
+                           artist_filter=artist_filter,
+                           genre_facets=genre_facets,
+                           artist_facets=artist_facets) 
 
 
 # PLAYLIST ACTIONS
@@ -526,7 +771,9 @@ def action_play_from_library(song_id):
     user = get_user_data(username)
     
     search_query = request.args.get('query', '')
-    queue_songs = global_library.search_songs(search_query)
+    genre_filter = request.args.get('genre', '').strip()
+    artist_filter = request.args.get('artist', '').strip()
+    queue_songs = get_library_songs(search_query, genre_filter, artist_filter)
     queue_ids = [s.id for s in queue_songs]
     
     if queue_ids:
@@ -661,45 +908,4 @@ def action_next_prev(action):
 
 
 if __name__ == '__main__':
-   
-    user1_playlists = USERS['user1']['playlists']
-  
-    user1_playlists['favorit'].add_song_id('1') 
-    user1_playlists['favorit'].add_song_id('3') 
-    user1_playlists['favorit'].add_song_id('5')
-    user1_playlists['mood'].add_song_id('2') 
-    user1_playlists['mood'].add_song_id('4')
-    user1_playlists['mood'].add_song_id('1') 
-   
-    user1_playlists['sad'].add_song_id('6')
-    user1_playlists['sad'].add_song_id('7')
-    user1_playlists['sad'].add_song_id('8')
-    user1_playlists['sad'].add_song_id('9')
-    user1_playlists['sad'].add_song_id('10')
-    
-    if 'user1' not in USERS:
-        USERS['user1'] = {
-            'password': 'user123',
-            'playlists': user1_playlists,
-            'active_playlist_name': None,
-            'current_song_id': None,
-            'current_node': None, 
-            'current_queue_ids': [],    
-            'current_queue_index': -1,
-            'explicit_queue_ids': []
-        }
-        
-        
-    if 'admin' not in USERS:
-         USERS['admin'] = {
-            'password': 'admin123',
-            'playlists': {},
-            'active_playlist_name': None,
-            'current_song_id': None,
-            'current_node': None, 
-            'current_queue_ids': [],    
-            'current_queue_index': -1,
-            'explicit_queue_ids': []
-        }
-
-    app.run(debug=True)
\ No newline at end of file
+    create_app().run(debug=True)
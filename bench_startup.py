@@ -0,0 +1,76 @@
+"""Benchmark waktu startup MOOSI+.
+
+Mengukur (1) cold import app.py di proses Python baru dan (2) waktu
+create_app() + request pertama (login user1 yang berhasil) untuk tiap
+mode seed. Mode 'none' tidak punya user, jadi kolom request dilewati.
+
+    python bench_startup.py [--runs N]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Dijalankan di proses baru agar setiap pengukuran benar-benar "cold".
+CHILD_SCRIPT = """
+import time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+app.create_app({seed!r})
+t2 = time.perf_counter()
+if {seed!r} == 'none':
+    print(t1 - t0, t2 - t1)
+else:
+    client = app.app.test_client()
+    resp = client.post('/', data={{'username': 'user1', 'password': 'user123'}})
+    t3 = time.perf_counter()
+    if resp.status_code != 302 or not resp.headers.get('Location', '').endswith('/user'):
+        raise SystemExit(f'login gagal: status {{resp.status_code}}')
+    print(t1 - t0, t2 - t1, t3 - t2)
+"""
+
+
+def run_child(seed):
+    """Menjalankan satu proses baru dan mengembalikan (import, create_app[, request pertama]) dalam detik."""
+    proc = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT.format(seed=seed)],
+        cwd=HERE, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.exit(f'Benchmark mode {seed!r} gagal:\n{proc.stderr}')
+    return [float(x) for x in proc.stdout.split()]
+
+
+def make_snapshot(path):
+    """Membuat file snapshot dari data seed default."""
+    sys.path.insert(0, HERE)
+    import app
+    app.create_app('eager')
+    app.save_snapshot(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = os.path.join(tmp, 'catalogue.json')
+        make_snapshot(snapshot_path)
+
+        print(f"{'mode':<10}{'import (ms)':>14}{'create_app (ms)':>18}{'request 1 (ms)':>17}")
+        for seed in ('none', 'eager', 'lazy', snapshot_path):
+            samples = [run_child(seed) for _ in range(args.runs)]
+            medians = [statistics.median(col) * 1000 for col in zip(*samples)]
+            label = 'snapshot' if seed == snapshot_path else seed
+            request_ms = f'{medians[2]:>17.2f}' if len(medians) > 2 else f"{'-':>17}"
+            print(f"{label:<10}{medians[0]:>14.2f}{medians[1]:>18.2f}{request_ms}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,352 @@
+"""Load test MOOSI+ dengan workload user sintetis.
+
+Setiap user sintetis login lewat route login lalu menjalankan campuran
+search/browse, play dari library, next/prev, dan edit playlist; satu
+thread admin menambah dan menghapus lagu secara berkala. Hasilnya:
+throughput, latensi p50/p95/p99 per route, dan pertumbuhan memori
+USERS dan global_library (hanya mode in-process).
+
+Mode utama adalah --url terhadap server yang dijalankan dengan snapshot
+berisi user sintetis. Jangan pakai `python app.py` (mode debug dengan
+debugger dan reloader) karena angka latensinya tidak bermakna:
+
+    python loadtest.py --write-snapshot load.json --users 50
+    MOOSI_SEED=load.json flask --app "app:create_app()" run   # lalu:
+    python loadtest.py --url http://127.0.0.1:5000 --users 50
+
+Tanpa --url, test berjalan in-process lewat Flask test client (uji cepat):
+
+    python loadtest.py --users 50 --duration 30
+"""
+import argparse
+import functools
+import http.cookiejar
+import math
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import app as moosi
+
+GENRES = ['Pop', 'Rock', 'Hip Hop', 'K-Pop', 'Jazz', 'R&B', 'Indie', 'EDM']
+SEARCH_TERMS = ['love', 'night', 'song', 'the', 'pop', 'rock', 'coldplay', 'blue', '1', 'x']
+LOAD_PASSWORD = 'load123'
+
+# Bobot tiap aksi user sintetis (nama aksi -> bobot relatif)
+USER_MIX = {
+    'search': 25,
+    'browse': 10,
+    'play_from_library': 20,
+    'next_prev': 30,
+    'add_to_playlist': 8,
+    'remove_from_playlist': 5,
+    'create_playlist': 2,
+}
+
+
+# SESSION KLIEN: TEST CLIENT ATAU HTTP
+
+class TestClientSession:
+    """Session berbasis Flask test client (in-process, tanpa server)."""
+    def __init__(self):
+        self.client = moosi.app.test_client()
+
+    def request(self, method, path, data=None):
+        """Mengembalikan (status, header Location)."""
+        resp = self.client.open(path, method=method, data=data)
+        return resp.status_code, resp.headers.get('Location')
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+class HttpSession:
+    """Session HTTP ke server yang sedang berjalan (cookie disimpan per user)."""
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect)
+
+    def request(self, method, path, data=None):
+        """Mengembalikan (status, header Location)."""
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(req) as resp:
+                resp.read()
+                return resp.status, resp.headers.get('Location')
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers.get('Location')
+
+
+def redirect_path(location):
+    """Path dari header Location (bisa absolut atau relatif)."""
+    return urllib.parse.urlsplit(location or '').path
+
+
+# DATA SINTETIS
+
+def synthetic_username(i):
+    return f'load{i}'
+
+
+def add_synthetic_data(num_users, num_songs, rng):
+    """Menambah lagu dan user sintetis (dengan 2 playlist) ke library dan USERS."""
+    for i in range(num_songs):
+        genre = rng.choice(GENRES)
+        moosi.global_library.add_song(f'{rng.choice(SEARCH_TERMS).title()} Song {i}',
+                                      f'Artist {i % 97}', genre)
+
+    song_ids = list(moosi.global_library.data.keys())
+    for i in range(num_users):
+        playlists = {
+            name: moosi.PlaylistDLL.from_song_ids(rng.sample(song_ids, min(5, len(song_ids))))
+            for name in ('harian', 'santai')
+        }
+        moosi.USERS[synthetic_username(i)] = moosi.new_user_data(LOAD_PASSWORD, playlists)
+
+
+def approx_size(root):
+    """Perkiraan ukuran memori (byte) seluruh objek yang dapat dicapai dari root."""
+    seen = set()
+    stack = [root]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            for key, value in list(obj.items()):
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(list(obj))
+        elif hasattr(obj, '__dict__'):
+            stack.append(obj.__dict__)
+    return total
+
+
+# WORKLOAD
+
+class Stats:
+    """Latensi (detik) dan status per route, dikumpulkan per thread lalu digabung.
+    Status >= 400 dan redirect ke halaman login dihitung sebagai error."""
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, route, seconds, status, location=None):
+        self.latencies.setdefault(route, []).append(seconds)
+        if status >= 400 or (300 <= status < 400 and redirect_path(location) == '/'):
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def merge(self, other):
+        for route, values in other.latencies.items():
+            self.latencies.setdefault(route, []).extend(values)
+        for route, count in other.errors.items():
+            self.errors[route] = self.errors.get(route, 0) + count
+
+
+def timed(session, stats, route, method, path, data=None):
+    start = time.perf_counter()
+    status, location = session.request(method, path, data)
+    stats.record(route, time.perf_counter() - start, status, location)
+    return status, location
+
+
+def login(session, stats, username, password, expected_path):
+    """Login dan pastikan server me-redirect ke expected_path; jika tidak, hentikan run."""
+    status, location = timed(session, stats, 'login', 'POST', '/',
+                             {'username': username, 'password': password})
+    if status not in (301, 302, 303) or redirect_path(location) != expected_path:
+        sys.exit(f'Login {username!r} gagal (status {status}, redirect {location!r}); '
+                 f'apakah server dijalankan dengan snapshot dari --write-snapshot?')
+
+
+def song_id_range():
+    """ID lagu maksimum yang dipakai untuk memilih lagu secara acak."""
+    return max(moosi.global_library.next_id - 1, 1)
+
+
+def run_user(session, deadline, max_song_id, stats, rng):
+    """Loop satu user sintetis (sudah login): jalankan aksi acak sampai deadline."""
+    playlists = ['harian', 'santai']
+    actions = list(USER_MIX)
+    weights = list(USER_MIX.values())
+
+    while time.perf_counter() < deadline:
+        action = rng.choices(actions, weights)[0]
+        song_id = str(rng.randint(1, max_song_id()))
+        query = urllib.parse.urlencode({'query': rng.choice(SEARCH_TERMS)})
+
+        if action == 'search':
+            timed(session, stats, action, 'GET', f'/user?view=library&{query}')
+        elif action == 'browse':
+            genre = urllib.parse.urlencode({'genre': rng.choice(GENRES)})
+            timed(session, stats, action, 'GET', f'/user?view=library&{genre}')
+        elif action == 'play_from_library':
+            timed(session, stats, action, 'POST', f'/action/play_from_library/{song_id}?{query}')
+        elif action == 'next_prev':
+            direction = rng.choice(['next', 'next', 'prev'])
+            timed(session, stats, action, 'POST', f'/action/next_prev/{direction}')
+        elif action == 'add_to_playlist':
+            timed(session, stats, action, 'POST', f'/action/add_to_playlist/{song_id}',
+                  {'playlist_name': rng.choice(playlists)})
+        elif action == 'remove_from_playlist':
+            name = urllib.parse.quote(rng.choice(playlists))
+            timed(session, stats, action, 'POST', f'/action/remove_from_playlist/{name}/{song_id}')
+        elif action == 'create_playlist':
+            name = f'mix {len(playlists)}'
+            timed(session, stats, action, 'POST', '/action/create_playlist', {'new_playlist_name': name})
+            playlists.append(name)
+
+
+def run_admin(session, deadline, interval, max_song_id, stats, rng):
+    """Loop admin (sudah login): tambah satu lagu lalu hapus satu lagu acak setiap interval."""
+    i = 0
+    while time.perf_counter() < deadline:
+        timed(session, stats, 'admin_add_song', 'POST', '/admin/add_song',
+              {'title': f'Admin Song {i}', 'artist': 'Admin', 'genre': rng.choice(GENRES)})
+        song_id = rng.randint(1, max_song_id())
+        timed(session, stats, 'admin_delete_song', 'POST', f'/admin/delete_song/{song_id}')
+        i += 1
+        time.sleep(interval)
+
+
+def memory_sample(start):
+    """(detik sejak start, jumlah lagu, jumlah user, byte library, byte USERS)."""
+    return (time.perf_counter() - start,
+            len(moosi.global_library.data), len(moosi.USERS),
+            approx_size(moosi.global_library), approx_size(moosi.USERS))
+
+
+def sample_memory(start, deadline, interval, samples):
+    """Sampling memori berkala selama run. Menelusuri seluruh graf objek sambil
+    memegang GIL, jadi ikut memperlambat thread user; pakai interval besar."""
+    while True:
+        time.sleep(min(interval, max(deadline - time.perf_counter(), 0)))
+        if time.perf_counter() >= deadline:
+            return
+        samples.append(memory_sample(start))
+
+
+# LAPORAN
+
+def percentile(sorted_values, pct):
+    """Percentile nearest-rank dari list yang sudah terurut."""
+    index = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def print_report(stats, elapsed, samples, in_process=True):
+    total = sum(len(v) for v in stats.latencies.values())
+    print(f'\n{total} request dalam {elapsed:.1f} s = {total / elapsed:.1f} req/s\n')
+    print(f"{'route':<22}{'count':>8}{'err':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for route in sorted(stats.latencies):
+        values = sorted(stats.latencies[route])
+        p50, p95, p99 = (percentile(values, p) * 1000 for p in (50, 95, 99))
+        print(f'{route:<22}{len(values):>8}{stats.errors.get(route, 0):>6}'
+              f'{len(values) / elapsed:>9.1f}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}')
+
+    for route in sorted(stats.latencies):
+        if stats.errors.get(route, 0) == len(stats.latencies[route]):
+            print(f'PERINGATAN: semua request {route} gagal; angka latensinya tidak bermakna.')
+
+    if not in_process:
+        print('\nUkuran memori USERS dan global_library hanya tersedia di mode in-process (tanpa --url).')
+    elif samples:
+        print(f"\n{'t (s)':>7}{'songs':>8}{'users':>8}{'library KB':>13}{'USERS KB':>11}")
+        for t, songs, users, lib_bytes, users_bytes in samples:
+            print(f'{t:>7.1f}{songs:>8}{users:>8}{lib_bytes / 1024:>13.1f}{users_bytes / 1024:>11.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--users', type=int, default=20, help='jumlah user sintetis (thread)')
+    parser.add_argument('--songs', type=int, default=1000, help='jumlah lagu sintetis tambahan')
+    parser.add_argument('--duration', type=float, default=10.0, help='lama test (detik)')
+    parser.add_argument('--url', help='base URL server; tanpa ini pakai Flask test client')
+    parser.add_argument('--max-song-id', type=int, help='ID lagu maksimum (mode --url)')
+    parser.add_argument('--admin-password', default='admin123')
+    parser.add_argument('--admin-interval', type=float, default=0.5, help='jeda aksi admin (detik)')
+    parser.add_argument('--sample-interval', type=float, default=0.0,
+                        help='jeda sampling memori selama run (detik); 0 = hanya sebelum dan sesudah run')
+    parser.add_argument('--write-snapshot', metavar='PATH',
+                        help='tulis snapshot berisi data sintetis untuk server lalu keluar')
+    parser.add_argument('--seed', type=int, default=0, help='seed random')
+    args = parser.parse_args()
+    if args.url and args.write_snapshot:
+        parser.error('--write-snapshot tidak bisa dipakai bersama --url')
+
+    rng = random.Random(args.seed)
+
+    if args.url:
+        max_id = args.max_song_id or len(moosi.SEED_SONGS) + args.songs
+
+        def max_song_id():
+            return max_id
+        new_session = functools.partial(HttpSession, args.url)
+    else:
+        moosi.create_app('eager')
+        add_synthetic_data(args.users, args.songs, rng)
+        if args.write_snapshot:
+            moosi.save_snapshot(args.write_snapshot)
+            print(f'Snapshot ditulis ke {args.write_snapshot}; jalankan server dengan '
+                  f'MOOSI_SEED={args.write_snapshot} flask --app "app:create_app()" run')
+            return
+        max_song_id = song_id_range
+        new_session = TestClientSession
+
+    # Login semua session dulu (di luar jendela waktu); run dihentikan jika ada yang gagal
+    thread_stats = [Stats() for _ in range(args.users + 1)]
+    sessions = []
+    for i in range(args.users):
+        session = new_session()
+        login(session, thread_stats[i], synthetic_username(i), LOAD_PASSWORD, '/user')
+        sessions.append(session)
+    admin_session = new_session()
+    login(admin_session, thread_stats[-1], 'admin', args.admin_password, '/admin_dashboard')
+
+    samples = []
+    start = time.perf_counter()
+    if not args.url:
+        samples.append(memory_sample(start))
+        start = time.perf_counter()
+
+    deadline = start + args.duration
+    threads = [
+        threading.Thread(target=run_user, args=(sessions[i], deadline, max_song_id,
+                                                thread_stats[i], random.Random(rng.random())))
+        for i in range(args.users)
+    ]
+    threads.append(threading.Thread(target=run_admin, args=(admin_session, deadline, args.admin_interval,
+                                                            max_song_id, thread_stats[-1],
+                                                            random.Random(rng.random()))))
+    if not args.url and args.sample_interval > 0:
+        threads.append(threading.Thread(target=sample_memory,
+                                         args=(start, deadline, args.sample_interval, samples)))
+
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if not args.url:
+        samples.append(memory_sample(start))
+
+    stats = Stats()
+    for s in thread_stats:
+        stats.merge(s)
+    print_report(stats, elapsed, samples, in_process=not args.url)
+
+
+if __name__ == '__main__':
+    main()